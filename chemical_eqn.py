@@ -1,21 +1,29 @@
+import copy
+import functools
+import re
 from collections import Counter
 from dataclasses import dataclass
-from functools import reduce
-from typing import Callable, Union
+from typing import Union
 
-ZERO_SUB = ord("₀")
+_SUB_TABLE = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
+# elements, subscripts, brackets and leading coefficients in one pass
+_TOKEN_RE = re.compile(r"([A-Z][a-z]*)(\d*)|([(\[{])|([)\]}])(\d*)|(\d+)")
 
 
 def get_subscript(n: int) -> str:
-    return "".join(chr(ZERO_SUB + int(i)) for i in str(n))
+    return str(n).translate(_SUB_TABLE)
+
+
+_CLOSING: dict[str, str] = {
+    "(": ")",
+    "[": "]",
+    "{": "}",
+}
 
 
 def get_closing_bracket(b: str) -> str | None:
-    return {
-        "(": ")",
-        "[": "]",
-        "{": "}",
-    }.get(b)
+    return _CLOSING.get(b)
 
 
 def coef_convert(v: int) -> str:
@@ -51,6 +59,7 @@ class Group:
         children: list[Union[ElementGroup, "Group"]],
         is_sub: bool = False,
     ) -> None:
+        self._atom_cache: dict[str, int] | None = None
         self.coef = coef
         self.is_sub = is_sub
         if children:
@@ -58,18 +67,32 @@ class Group:
         else:
             raise ValueError("Children cannot be empty")
 
+    @property
+    def coef(self) -> int:
+        return self._coef
+
+    @coef.setter
+    def coef(self, value: int) -> None:
+        # the cached atom counts are scaled by the coefficient
+        self._atom_cache = None
+        self._coef = value
+
     @property
     def atom_count_mapping(self) -> dict[str, int]:
         """Returns a dict mapping every atom type to its number"""
-        counter: Counter[str] = Counter()
-        for child in self.children:
-            match child:
-                case ElementGroup() as g:
-                    counter[g.atom] += g.coef
-                case Group() as g:
-                    # adds the count of the atoms of `g`
-                    counter.update(g.atom_count_mapping)
-        return {atom: self.coef * coef for atom, coef in counter.items()}
+        if self._atom_cache is None:
+            counter: Counter[str] = Counter()
+            for child in self.children:
+                match child:
+                    case ElementGroup() as g:
+                        counter[g.atom] += g.coef
+                    case Group() as g:
+                        # adds the count of the atoms of `g`
+                        counter.update(g.atom_count_mapping)
+            self._atom_cache = {
+                atom: self.coef * coef for atom, coef in counter.items()
+            }
+        return self._atom_cache
 
     @property
     def atom_count(self) -> int:
@@ -78,8 +101,9 @@ class Group:
 
     @staticmethod
     def parse(s: str) -> "Group":
-        lexer = GroupLexer(s)
-        return lexer.get_group()
+        # the solver mutates group coefficients, so hand out a private copy
+        # of the cached parse
+        return copy.deepcopy(_parse_cached(s))
 
     def __eq__(self, o: object) -> bool:
         return (
@@ -98,6 +122,31 @@ class Group:
         return self.__str__()
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_cached(s: str) -> Group:
+    coef = 1
+    # one (expected closing bracket, children) frame per nesting level
+    frames: list[tuple[str | None, list[Union[ElementGroup, Group]]]] = [(None, [])]
+    for m in _TOKEN_RE.finditer(s):
+        # lastindex identifies the token kind without materializing all six
+        # capture groups: 2 = element, 3 = open bracket, 5 = close bracket,
+        # 6 = bare number
+        kind = m.lastindex
+        if kind == 2:
+            sub = m.group(2)
+            frames[-1][1].append(ElementGroup(int(sub) if sub else 1, m.group(1)))
+        elif kind == 3:
+            frames.append((get_closing_bracket(m.group(3)), []))
+        elif kind == 5:
+            if len(frames) > 1 and m.group(4) == frames[-1][0]:
+                _, children = frames.pop()
+                sub = m.group(5)
+                frames[-1][1].append(Group(int(sub) if sub else 1, children, True))
+        elif m.start() == 0:
+            coef = int(m.group(6))
+    return Group(coef, frames[0][1])
+
+
 def _switcheroo(l: list[Group], r: list[Group], is_l: bool) -> list[Group]:
     """Used to switch """
     return [
@@ -116,6 +165,8 @@ class ChemEquation:
             # the old switcheroo
             self.lhs = _switcheroo(lhs, rhs, True)
             self.rhs = _switcheroo(lhs, rhs, False)
+            self._lhs_map: dict[str, int] | None = None
+            self._rhs_map: dict[str, int] | None = None
 
         else:
             raise ValueError("Both sides of the equation must not be empty")
@@ -127,11 +178,18 @@ class ChemEquation:
 
     def _atom_count_mapping(self, is_left: bool) -> dict[str, int]:
         """Returns a dict mapping every atom type to its number"""
-        return reduce(
-            lambda x, y: x + Counter(y),
-            (i.atom_count_mapping for i in (self.lhs if is_left else self.rhs)),
-            Counter[str](),
-        )
+        cached = self._lhs_map if is_left else self._rhs_map
+        if cached is not None:
+            return cached
+        mapping: dict[str, int] = {}
+        for group in self.lhs if is_left else self.rhs:
+            for atom, n in group.atom_count_mapping.items():
+                mapping[atom] = mapping.get(atom, 0) + n
+        if is_left:
+            self._lhs_map = mapping
+        else:
+            self._rhs_map = mapping
+        return mapping
 
     @property
     def atom_count(self) -> int:
@@ -140,7 +198,14 @@ class ChemEquation:
     @property
     def is_balanced(self) -> bool:
         """Returns `True` if the chemical equation is balanced otherwise `False`"""
-        return self._atom_count_mapping(True) == self._atom_count_mapping(False)
+        # accumulate lhs positive and rhs negative; balanced means every
+        # atom's delta is zero
+        delta: Counter[str] = Counter()
+        for g in self.lhs:
+            delta.update(g.atom_count_mapping)
+        for g in self.rhs:
+            delta.subtract(g.atom_count_mapping)
+        return not any(delta.values())
 
     @staticmethod
     def parse(s: str) -> "ChemEquation":
@@ -156,66 +221,6 @@ class ChemEquation:
         return f"{l} -> {r}"
 
 
-class GroupLexer:
-    def __init__(self, text: str) -> None:
-        self.text = text
-        self._index = 0
-
-    @property
-    def at_end(self) -> bool:
-        return self._index > len(self.text) - 1
-
-    def consume(self) -> str:
-        self._index += 1
-        return self.text[self._index - 1]
-
-    def peek(self, n: int = 1) -> str:
-        return self.text[self._index : self._index + n]
-
-    def consume_numeric(self) -> int:
-        coef_s = ""
-        while self.peek().isnumeric():
-            coef_s += self.consume()
-        return int(coef_s)
-
-    def consume_while(self, fn: Callable[[int, str], bool]) -> str:
-        c = ""
-        while not self.at_end and fn(self._index, self.peek()):
-            c += self.consume()
-        return c
-
-    def consume_coef(self) -> int:
-        """Returns the next number in `text` if it exists otherwise returns 1"""
-        return self.consume_numeric() if self.peek().isnumeric() else 1
-
-    def get_group(self) -> Group:
-        coef = self.consume_coef()
-
-        elems: list[ElementGroup | Group] = []
-
-        while not self.at_end:
-            c = self.consume()
-            if c.isupper():
-                while not self.at_end and self.peek().islower():
-                    c += self.consume()
-                mul = self.consume_coef()
-                try:
-                    elems.append(ElementGroup(mul, c))
-                except:
-                    continue
-            if (closing_bracket := get_closing_bracket(c)) is not None:
-                sub_group_text = self.consume_while(lambda _, ch: ch != closing_bracket)
-                self.consume()  # consume closing bracket
-
-                sub_group = GroupLexer(sub_group_text).get_group()
-                sub_group.coef = self.consume_coef()
-                sub_group.is_sub = True
-
-                elems.append(sub_group)
-
-        return Group(coef, elems)
-
-
 if __name__ == "__main__":
     while True:
         eqn = ChemEquation.parse(input("> "))
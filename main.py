@@ -4,15 +4,33 @@ from solvers import CouldNotSolveException, MatrixSolver
 CURSOR_UP = "\x1B[1A"
 CLEAR_LINE = "\x1B[2K"
 
+
+def canonicalize(raw: str) -> str:
+    """
+    Canonical cache key for an equation: species sorted per side with any
+    entered coefficients stripped, so retyped equations hit the cache
+    """
+    l, r, *_ = raw.split("->")
+    return " -> ".join(
+        " + ".join(sorted(s.strip().lstrip("0123456789") for s in side.split("+")))
+        for side in (l, r)
+    )
+
+
 if __name__ == "__main__":
+    solve_cache: dict[str, ChemEquation] = {}
     while True:
         try:
-            rxn = ChemEquation.parse(input("> "))
+            raw = input("> ")
+            rxn = ChemEquation.parse(raw)
             print(f"{CURSOR_UP}{CLEAR_LINE}In: {rxn}")
-            solver = MatrixSolver(rxn)
-            print(f"Out: {solver.balance()}")
+            key = canonicalize(raw)
+            if (balanced := solve_cache.get(key)) is None:
+                balanced = MatrixSolver(rxn).balance()
+                solve_cache[key] = balanced
+            print(f"Out: {balanced}")
             print()
         except CouldNotSolveException as e:
-            print(f"We couldn't balance your equation\n{e}")   
+            print(f"We couldn't balance your equation\n{e}")
         except Exception as e:
             print(e)